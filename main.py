@@ -6,7 +6,7 @@ Shows a mini game where you have to defend against enemy fighter planes.
 What does it show you about pygame?
 
 * pg.sprite, the difference between Sprite and Group.
-* dirty rectangle optimization for processing for speed.
+* dirty rectangle updates versus a full display flip (USE_DIRTY_RECTS).
 * music with pg.mixer.music, including fadeout
 * sound effects with pg.Sound
 * event processing, keyboard handling, QUIT handling.
@@ -25,10 +25,12 @@ Controls
 
 import os
 import random
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 # import basic pygame modules
 import pygame as pg
-import vlc
 
 # see if we can load more than standard BMP
 if not pg.image.get_extended():
@@ -40,24 +42,45 @@ MAX_SHOTS = 2  # most player bullets onscreen
 ENEMY_ODDS = 22  # chances a new enemy appears
 BULLET_ODDS = 60  # chances a new bullet will be shot
 ENEMY_RELOAD = 12  # frames between new enemies
+ROLL_CHUNK = 1024  # random rolls generated per refill
+MAX_POOLED = 16  # most dead sprites of one kind kept for reuse
 SCREENRECT = pg.Rect(0, 0, 640, 480)
-SCORE = 0
+SCREENHEIGHT = SCREENRECT.height
+USE_DIRTY_RECTS = False  # update only changed rects instead of flipping
+BACKGROUND = None  # the tiled water surface, built by load_images()
 
 main_dir = os.path.split(os.path.abspath(__file__))[0]
 
 
-def load_image(file):
-    """loads an image, prepares it for play"""
+@lru_cache(maxsize=None)
+def load_image(file, rle=False):
+    """loads an image, prepares it for play
+
+    Images are converted to the display format without per-pixel alpha.
+    With rle set, a colorkey the file already carries (as GIFs can) is
+    re-applied with RLE acceleration, the fast blit path for keyed sprites.
+
+    Results are cached, so callers share the same Surface and must not
+    modify it in place.
+    """
     file = os.path.join(main_dir, "data", file)
     try:
         surface = pg.image.load(file)
     except pg.error:
         raise SystemExit(f'Could not load image "{file}" {pg.get_error()}')
-    return surface.convert()
+    surface = surface.convert()
+    colorkey = surface.get_colorkey()
+    if rle and colorkey is not None:
+        surface.set_colorkey(colorkey, pg.RLEACCEL)
+    return surface
 
 
+@lru_cache(maxsize=None)
 def load_sound(file):
-    """because pygame can be be compiled without mixer."""
+    """because pygame can be be compiled without mixer.
+
+    Results are cached like load_image().
+    """
     if not pg.mixer:
         return None
     file = os.path.join(main_dir, "data", file)
@@ -69,12 +92,70 @@ def load_sound(file):
     return None
 
 
+class RollStream:
+    """Hands out random ints in range(n), generated ROLL_CHUNK at a time.
+
+    Refilling turns one randbytes() call into a whole buffer of rolls, so
+    each roll() is just a list index.
+    """
+
+    def __init__(self, n, chunk=ROLL_CHUNK):
+        self.n = n
+        self.chunk = chunk
+        self.refill()
+
+    def refill(self):
+        n = self.n
+        # 16 bit samples keep the modulo bias negligible for small n
+        self.buf = [v % n for v in array("H", random.randbytes(2 * self.chunk))]
+        self.i = 0
+
+    def roll(self):
+        if self.i == self.chunk:
+            self.refill()
+        v = self.buf[self.i]
+        self.i += 1
+        return v
+
+
 # Each type of game object gets an init and an update function.
 # The update function is called once per frame, and it is when each object should
 # change its current position and state.
 #
 # The Player object actually gets a "move" function instead of update,
 # since it is passed extra information about the keyboard.
+#
+# Enemies, Shots and EnemyBullets only ever travel straight up or down, so
+# their movement lives in an "advance" classmethod that moves a whole group
+# in one pass, rather than dispatching to an update method per sprite.
+#
+# Short lived objects are PooledSprites: create them with spawn() so that a
+# killed sprite gets reset and reused instead of allocating a new one.
+
+
+class PooledSprite(pg.sprite.Sprite):
+    """A sprite that is recycled after it is killed.
+
+    Subclasses need their own _pool list, and a reset() method that puts
+    the sprite back in play (in its containers) with the spawn() arguments.
+    """
+
+    pool_size = MAX_POOLED
+
+    @classmethod
+    def spawn(cls, *args):
+        """returns a reset dead sprite if one is pooled, else a new one."""
+        if cls._pool:
+            sprite = cls._pool.pop()
+            sprite.reset(*args)
+            return sprite
+        return cls(*args)
+
+    def kill(self):
+        if self.alive():
+            pg.sprite.Sprite.kill(self)
+            if len(self._pool) < self.pool_size:
+                self._pool.append(self)
 
 
 class Player(pg.sprite.Sprite):
@@ -85,6 +166,7 @@ class Player(pg.sprite.Sprite):
     gun_offset = -11
     images = []
     animcycle = 12
+    frame_table = []
 
     def __init__(self):
         pg.sprite.Sprite.__init__(self, self.containers)
@@ -112,43 +194,67 @@ class Player(pg.sprite.Sprite):
 
     def update(self):
         self.frame += 1
-        self.image = self.images[self.frame // self.animcycle % len(Player.images)]
+        self.image = self.frame_table[self.frame % len(self.frame_table)]
 
 
-class Enemy(pg.sprite.Sprite):
+class Enemy(PooledSprite):
     """An enemy fighter plane. Moves directly down the screen"""
 
     speed = 5
     animcycle = 12
     images = []
+    frame_table = []
+    spawn_x = RollStream(SCREENRECT.width)
+    img_h = 0  # tallest image, set by load_images()
+    _pool = []
 
     def __init__(self):
-        pg.sprite.Sprite.__init__(self, self.containers)
+        pg.sprite.Sprite.__init__(self)
+        self.rect = self.images[0].get_rect()
+        self.reset()
+
+    def reset(self):
+        # the rect has to be placed before joining a RectGroup
         self.image = self.images[0]
-        self.rect = self.image.get_rect(topleft=(random.random() * SCREENRECT.width, -self.image.get_height()))
+        self.rect.topleft = (self.spawn_x.roll(), -self.img_h)
         self.facing = Enemy.speed
         self.frame = 0
+        self.add(self.containers)
+
+    @classmethod
+    def advance(cls, enemies):
+        """moves every enemy down the screen, removing those that left it."""
+        height = SCREENHEIGHT
+        for enemy in enemies.sprites():
+            rect = enemy.rect
+            rect.top += enemy.facing
+            if rect.top >= height:
+                enemy.kill()
 
     def update(self):
-        self.rect.move_ip(0, self.facing)
-        if self.rect.top >= SCREENRECT.height:
-            self.kill()
         self.frame = self.frame + 1
-        self.image = self.images[self.frame // self.animcycle % len(Enemy.images)]
+        self.image = self.frame_table[self.frame % len(self.frame_table)]
 
 
-class Explosion(pg.sprite.Sprite):
+class Explosion(PooledSprite):
     """An explosion. Hopefully the enemy and not the player!"""
 
     defaultlife = 12
     animcycle = 3
     images = []
+    frame_table = []  # indexed by the remaining life
+    _pool = []
 
     def __init__(self, actor):
-        pg.sprite.Sprite.__init__(self, self.containers)
+        pg.sprite.Sprite.__init__(self)
+        self.rect = self.images[0].get_rect()
+        self.reset(actor)
+
+    def reset(self, actor):
         self.image = self.images[0]
-        self.rect = self.image.get_rect(center=actor.rect.center)
+        self.rect.center = actor.rect.center
         self.life = self.defaultlife
+        self.add(self.containers)
 
     def update(self):
         """called every time around the game loop.
@@ -159,97 +265,301 @@ class Explosion(pg.sprite.Sprite):
         Also we animate the explosion.
         """
         self.life = self.life - 1
-        self.image = self.images[self.life // self.animcycle % 2]
+        self.image = self.frame_table[self.life]
         if self.life <= 0:
             self.kill()
 
 
-class Shot(pg.sprite.Sprite):
+class Shot(PooledSprite):
     """a bullet the Player sprite fires."""
 
     speed = -11
     images = []
+    img_h = 0  # tallest image, set by load_images()
+    _pool = []
 
     def __init__(self, pos):
-        pg.sprite.Sprite.__init__(self, self.containers)
+        pg.sprite.Sprite.__init__(self)
         self.image = self.images[0]
-        self.rect = self.image.get_rect(midbottom=pos)
+        self.rect = self.image.get_rect()
+        self.reset(pos)
 
-    def update(self):
+    def reset(self, pos):
+        self.rect.midbottom = pos
+        self.add(self.containers)
+
+    @classmethod
+    def advance(cls, shots):
         """called every time around the game loop.
 
-        Every tick we move the shot upwards.
+        Every tick we move the shots upwards.
         """
-        self.rect.move_ip(0, self.speed)
-        if self.rect.top <= -self.image.get_height():
-            self.kill()
+        speed = cls.speed
+        top = -cls.img_h
+        for shot in shots.sprites():
+            rect = shot.rect
+            rect.top += speed
+            if rect.top <= top:
+                shot.kill()
 
 
-class EnemyBullet(pg.sprite.Sprite):
+class EnemyBullet(PooledSprite):
     """A bullet the enemy fighters shoot."""
 
     speed = 9
     images = []
+    _pool = []
 
     def __init__(self, enemy):
-        pg.sprite.Sprite.__init__(self, self.containers)
+        pg.sprite.Sprite.__init__(self)
         self.image = self.images[0]
-        self.rect = self.image.get_rect(midbottom=enemy.rect.move(0, 5).midbottom)
+        self.rect = self.image.get_rect()
+        self.reset(enemy)
 
-    def update(self):
+    def reset(self, enemy):
+        # the rect has to be placed before joining a RectGroup
+        self.rect.midbottom = (enemy.rect.centerx, enemy.rect.bottom + 5)
+        self.add(self.containers)
+
+    @classmethod
+    def advance(cls, enemy_bullets):
         """called every time around the game loop.
 
-        Every frame we move the sprite 'rect' down.
+        Every frame we move each bullet's 'rect' down.
         When it reaches the bottom we:
 
         - remove the bullet.
         """
-        self.rect.move_ip(0, self.speed)
-        if self.rect.bottom >= SCREENRECT.height:
-            self.kill()
+        speed = cls.speed
+        height = SCREENHEIGHT
+        for bullet in enemy_bullets.sprites():
+            rect = bullet.rect
+            rect.top += speed
+            if rect.bottom >= height:
+                bullet.kill()
+
+
+@dataclass
+class GameState:
+    """The state of one game that outlives any single sprite."""
+
+    score: int = 0
+    enemyreload: int = ENEMY_RELOAD
+    enemy_rolls: RollStream = field(default_factory=lambda: RollStream(ENEMY_ODDS))
+    bullet_rolls: RollStream = field(default_factory=lambda: RollStream(BULLET_ODDS))
 
 
 class Score(pg.sprite.Sprite):
-    """to keep track of the score."""
+    """to keep track of the score.
 
-    def __init__(self):
+    The text is composed from glyphs prerendered by load_images(), so a
+    score change only blits a few digits instead of rendering with the font.
+    """
+
+    color = "white"
+    maxdigits = 8
+    label = None
+    digit_imgs = []
+    digit_offsets = []  # x of a leading digit, after the label
+    digit_advances = []  # [a][b] is the step from digit a to a following b
+
+    def __init__(self, state):
         pg.sprite.Sprite.__init__(self)
-        self.font = pg.font.Font(None, 20)
-        self.font.set_italic(1)
-        self.color = "white"
+        self.state = state
+        width = self.label.get_width() + self.maxdigits * max(im.get_width() for im in self.digit_imgs)
+        self.image = pg.Surface((width, self.label.get_height()))
+        self.image.set_colorkey((0, 0, 0))
         self.lastscore = -1
         self.update()
         self.rect = self.image.get_rect().move(10, 450)
 
     def update(self):
         """We only update the score in update() when it has changed."""
-        if SCORE != self.lastscore:
-            self.lastscore = SCORE
-            msg = "Score: %d" % SCORE
-            self.image = self.font.render(msg, 0, self.color)
+        score = self.state.score
+        if score != self.lastscore:
+            self.lastscore = score
+            image = self.image
+            image.fill((0, 0, 0))
+            image.blit(self.label, (0, 0))
+            digits = [int(digit) for digit in str(score)]
+            x = self.digit_offsets[digits[0]]
+            for d, e in zip(digits, digits[1:]):
+                image.blit(self.digit_imgs[d], (x, 0))
+                x += self.digit_advances[d][e]
+            image.blit(self.digit_imgs[digits[-1]], (x, 0))
+
+
+class RectGroup(pg.sprite.Group):
+    """A Group that keeps a list of its members' rects up to date.
+
+    The lists are maintained as sprites join and leave, so collision tests
+    can hand them straight to Rect.collidelistall. Members must keep the
+    same rect object for as long as they are in the group.
+    """
+
+    def __init__(self, *sprites):
+        self.members = []
+        self.rects = []
+        pg.sprite.Group.__init__(self, *sprites)
+
+    def add_internal(self, sprite, layer=None):
+        pg.sprite.Group.add_internal(self, sprite, layer)
+        self.members.append(sprite)
+        self.rects.append(sprite.rect)
+
+    def remove_internal(self, sprite):
+        pg.sprite.Group.remove_internal(self, sprite)
+        i = self.members.index(sprite)
+        del self.members[i]
+        del self.rects[i]
+
+
+def collide_sprite(sprite, group):
+    """kills and returns the members of a RectGroup that overlap sprite.
+
+    Works like pg.sprite.spritecollide(sprite, group, 1), but every overlap
+    test runs inside a single Rect.collidelistall call.
+    """
+    members = group.members
+    hits = [members[i] for i in sprite.rect.collidelistall(group.rects)]
+    for hit in hits:
+        hit.kill()
+    return hits
+
+
+def collide_groups(groupa, groupb):
+    """kills the overlapping members of both groups, returns those of groupa.
+
+    groupa must be a RectGroup and groupb the smaller group. Each member of
+    groupb is tested against all of groupa with one Rect.collidelistall call.
+    """
+    members = groupa.members
+    rects = groupa.rects
+    hits = {}
+    for sprite in groupb.sprites():
+        indices = sprite.rect.collidelistall(rects)
+        if indices:
+            sprite.kill()
+            hits.update(dict.fromkeys(members[i] for i in indices))
+    for hit in hits:
+        hit.kill()
+    return list(hits)
+
+
+def tick(state, player, direction, firing, enemies, shots, enemy_bullets, lastenemy):
+    """runs one simulation step with this frame's player input.
+
+    Moves the shots, enemies and enemy bullets, then the player, fires a
+    shot if one is due, rolls for new enemies and bullets, and finally
+    resolves every collision. Returns whether a shot was fired and how
+    many explosions went off, so the caller can play the sounds.
+    """
+    Enemy.advance(enemies)
+    Shot.advance(shots)
+    EnemyBullet.advance(enemy_bullets)
+
+    # handle player input
+    player.move(direction)
+    fired = not player.reloading and firing and len(shots) < MAX_SHOTS
+    if fired:
+        Shot.spawn(player.gunpos())
+    player.reloading = firing
+
+    # Create new enemy
+    if state.enemyreload:
+        state.enemyreload -= 1
+    elif not state.enemy_rolls.roll():
+        Enemy.spawn()
+        state.enemyreload = ENEMY_RELOAD
+
+    # shoot enemy bullets
+    if lastenemy and not state.bullet_rolls.roll():
+        EnemyBullet.spawn(lastenemy.sprite)
+
+    booms = 0
+
+    # Detect collisions between enemies and players.
+    for enemy in collide_sprite(player, enemies):
+        booms += 1
+        Explosion.spawn(enemy)
+        Explosion.spawn(player)
+        state.score += 1
+        player.kill()
+
+    # See if shots hit the enemies.
+    for enemy in collide_groups(enemies, shots):
+        booms += 1
+        Explosion.spawn(enemy)
+        state.score += 1
+
+    # See if enemy bullets hit the player.
+    for enemy_bullet in collide_sprite(player, enemy_bullets):
+        booms += 1
+        Explosion.spawn(player)
+        player.kill()
+
+    return fired, booms
+
+
+def tile_background(bgdtile: pg.surface.Surface) -> pg.surface.Surface:
+    """tiles bgdtile over the whole screen, one row then one column of blits"""
+    row = pg.Surface((SCREENRECT.width, bgdtile.get_height())).convert()
+    for x in range(0, SCREENRECT.width, bgdtile.get_width()):
+        row.blit(bgdtile, (x, 0))
+    background = pg.Surface(SCREENRECT.size).convert()
+    for y in range(0, SCREENRECT.height, bgdtile.get_height()):
+        background.blit(row, (0, y))
+    return background
 
 
 def render_background(screen: pg.surface.Surface) -> pg.surface.Surface:
-    bgdtile = load_image("water.png")
-    background = pg.Surface(SCREENRECT.size)
-    for x in range(0, SCREENRECT.width, bgdtile.get_width()):
-        for y in range(0, SCREENRECT.height, bgdtile.get_height()):
-            background.blit(bgdtile, (x, y))
-    screen.blit(background, (0, 0))
+    screen.blit(BACKGROUND, (0, 0))
     pg.display.flip()
-    return background
+    return BACKGROUND
+
+
+def build_frame_table(images, animcycle, length=None):
+    """precomputes which image to show on each frame of an animation.
+
+    By default the table covers one full cycle through the images, so a
+    sprite can index it with frame % len(table) instead of dividing.
+    """
+    if length is None:
+        length = animcycle * len(images)
+    return [images[i // animcycle % len(images)] for i in range(length)]
 
 
 def load_images():
     # Load images, assign to sprite classes
     # (do this before the classes are used, after screen setup)
     Player.images = [load_image(im) for im in ("player1.png", "player2.png", "player3.png")]
-    img = load_image("explosion.gif")
+    img = load_image("explosion.gif", rle=True)
     Explosion.images = [img, pg.transform.flip(img, 1, 1)]
     Enemy.images = [load_image(im) for im in ("enemy.png",)]
     EnemyBullet.images = [load_image("enemy_bullet.jpg")]
     Shot.images = [load_image("shot.png")]
 
+    Enemy.img_h = max(im.get_height() for im in Enemy.images)
+    Shot.img_h = max(im.get_height() for im in Shot.images)
+
+    Player.frame_table = build_frame_table(Player.images, Player.animcycle)
+    Enemy.frame_table = build_frame_table(Enemy.images, Enemy.animcycle)
+    Explosion.frame_table = build_frame_table(Explosion.images, Explosion.animcycle, Explosion.defaultlife + 1)
+
+    if pg.font:
+        font = pg.font.Font(None, 20)
+        font.set_italic(1)
+        Score.label = font.render("Score: ", False, Score.color)
+        Score.digit_imgs = [font.render(str(d), False, Score.color) for d in range(10)]
+        # glyph steps as the font lays them out, kerning and fractional advances included
+        width = [font.size(str(d))[0] for d in range(10)]
+        Score.digit_offsets = [font.size(f"Score: {d}")[0] - width[d] for d in range(10)]
+        Score.digit_advances = [[font.size(f"{a}{b}")[0] - width[b] for b in range(10)] for a in range(10)]
+
+    # the background never changes, so tile it once up front
+    global BACKGROUND
+    BACKGROUND = tile_background(load_image("water.png"))
+
 
 def decorate_game_window():
     icon = pg.transform.scale(Enemy.images[0], (32, 32))
@@ -261,10 +571,19 @@ def decorate_game_window():
 def initialize_sounds(PLAY_MUSIC: bool):
     boom_sound = load_sound("boom.wav")
     shoot_sound = load_sound("car_door.wav")
-    if PLAY_MUSIC:
-        music_file = os.path.join(main_dir, "data", "in_the_name_of_strikers.mp3")
-        music = vlc.MediaPlayer(music_file)
-        music.play()
+    if PLAY_MUSIC and pg.mixer:
+        # an ogg transcode (see README) starts faster than the mp3, prefer it
+        for music_file in ("in_the_name_of_strikers.ogg", "in_the_name_of_strikers.mp3"):
+            music_file = os.path.join(main_dir, "data", music_file)
+            if os.path.exists(music_file):
+                break
+        try:
+            pg.mixer.music.load(music_file)
+        except pg.error:
+            print(f"Warning, unable to load, {music_file}")
+            return boom_sound, shoot_sound
+        pg.mixer.music.set_volume(0.5)
+        pg.mixer.music.play(-1)
 
     return boom_sound, shoot_sound
 
@@ -293,11 +612,15 @@ def main(winstyle=0):
     # load the sound effects
     boom_sound, shoot_sound = initialize_sounds(PLAY_MUSIC)
 
+    # only quitting and key presses are handled, keep anything else out of the queue
+    pg.event.set_blocked(None)
+    pg.event.set_allowed([pg.QUIT, pg.KEYDOWN])
+
     # Initialize Game Groups
-    enemies = pg.sprite.Group()
+    enemies = RectGroup()
     shots = pg.sprite.Group()
-    enemy_bullets = pg.sprite.Group()
-    all = pg.sprite.RenderUpdates()
+    enemy_bullets = RectGroup()
+    all = pg.sprite.Group()
     lastenemy = pg.sprite.GroupSingle()
 
     # assign default groups to each sprite class
@@ -309,28 +632,39 @@ def main(winstyle=0):
     Score.containers = all
 
     # Create Some Starting Values
-    global score
-    enemyreload = ENEMY_RELOAD
+    state = GameState()
     clock = pg.time.Clock()
 
     # initialize our starting sprites
-    global SCORE
     player = Player()
-    Enemy()  # note, this 'lives' because it goes into a sprite group
+    Enemy.spawn()  # note, this 'lives' because it goes into a sprite group
     if pg.font:
-        all.add(Score())
+        all.add(Score(state))
+
+    # screen areas the sprites were drawn over last frame
+    drawn = []
+
+    # bind everything the loop looks up each frame to locals
+    K_RIGHT, K_LEFT, K_SPACE = pg.K_RIGHT, pg.K_LEFT, pg.K_SPACE
+    K_f, K_ESCAPE, QUIT, KEYDOWN = pg.K_f, pg.K_ESCAPE, pg.QUIT, pg.KEYDOWN
+    event_get = pg.event.get
+    get_pressed = pg.key.get_pressed
+    display_update = pg.display.update
+    display_flip = pg.display.flip
+    mixer = pg.mixer
+    use_dirty_rects = USE_DIRTY_RECTS
 
     # Run our main loop whilst the player is alive.
     while player.alive():
 
         # get input
-        for event in pg.event.get():
-            if event.type == pg.QUIT:
+        for event in event_get((QUIT, KEYDOWN)):
+            if event.type == QUIT:
                 return
-            if event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE:
+            if event.type == KEYDOWN and event.key == K_ESCAPE:
                 return
-            elif event.type == pg.KEYDOWN:
-                if event.key == pg.K_f:
+            elif event.type == KEYDOWN:
+                if event.key == K_f:
                     if not fullscreen:
                         print("Changing to FULLSCREEN")
                         screen_backup = screen.copy()
@@ -341,64 +675,34 @@ def main(winstyle=0):
                         screen_backup = screen.copy()
                         screen = pg.display.set_mode(SCREENRECT.size, winstyle, bestdepth)
                         screen.blit(screen_backup, (0, 0))
-                    pg.display.flip()
+                    display_flip()
                     fullscreen = not fullscreen
 
-        keystate = pg.key.get_pressed()
+        ks = get_pressed()
 
         # clear/erase the last drawn sprites
-        all.clear(screen, background)
+        erased = drawn
+        screen.blits([(background, r, r) for r in erased])
 
         # update all the sprites
         all.update()
 
-        # handle player input
-        direction = keystate[pg.K_RIGHT] - keystate[pg.K_LEFT]
-        player.move(direction)
-        firing = keystate[pg.K_SPACE]
-        if not player.reloading and firing and len(shots) < MAX_SHOTS:
-            Shot(player.gunpos())
-            if pg.mixer:
+        # move everything, spawn, and resolve collisions
+        direction = ks[K_RIGHT] - ks[K_LEFT]
+        firing = ks[K_SPACE]
+        fired, booms = tick(state, player, direction, firing, enemies, shots, enemy_bullets, lastenemy)
+        if mixer:
+            if fired:
                 shoot_sound.play()
-        player.reloading = firing
-
-        # Create new enemy
-        if enemyreload:
-            enemyreload = enemyreload - 1
-        elif not int(random.random() * ENEMY_ODDS):
-            Enemy()
-            enemyreload = ENEMY_RELOAD
-
-        # shoot enemy bullets
-        if lastenemy and not int(random.random() * BULLET_ODDS):
-            EnemyBullet(lastenemy.sprite)
-
-        # Detect collisions between enemies and players.
-        for enemy in pg.sprite.spritecollide(player, enemies, 1):
-            if pg.mixer:
-                boom_sound.play()
-            Explosion(enemy)
-            Explosion(player)
-            SCORE = SCORE + 1
-            player.kill()
-
-        # See if shots hit the enemies.
-        for enemy in pg.sprite.groupcollide(enemies, shots, 1, 1).keys():
-            if pg.mixer:
-                boom_sound.play()
-            Explosion(enemy)
-            SCORE = SCORE + 1
-
-        # See if enemy bullets hit the player.
-        for enemy_bullet in pg.sprite.spritecollide(player, enemy_bullets, 1):
-            if pg.mixer:
+            for _ in range(booms):
                 boom_sound.play()
-            Explosion(player)
-            player.kill()
 
         # draw the scene
-        dirty = all.draw(screen)
-        pg.display.update(dirty)
+        drawn = screen.blits([(s.image, s.rect) for s in all.sprites()])
+        if use_dirty_rects:
+            display_update(erased + drawn)
+        else:
+            display_flip()
 
         # cap the framerate at 40fps. Also called 40HZ or 40 times per second.
         clock.tick(40)